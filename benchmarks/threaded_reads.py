@@ -0,0 +1,43 @@
+""" Field read throughput of a shared model instance with growing number of threads.
+
+On CPython with the GIL throughput stays flat, on free-threaded builds it should scale,
+since reads of thread-safe models do not take any locks.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from objectmodel import *
+
+
+READS_PER_THREAD = 200_000
+
+
+class User(ObjectModel):
+    THREAD_SAFE = True
+
+    id = Field(default=lambda: str(uuid4())[:8])
+    name = Field(required=True)
+    friends = ListCollectionField('User', default=list)
+
+
+def read(user: User) -> int:
+    for _ in range(READS_PER_THREAD):
+        user.id
+        user.name
+        user.friends
+    return READS_PER_THREAD * 3
+
+
+def main():
+    user = User(name='First')
+    for threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(threads) as pool:
+            start = time.perf_counter()
+            reads = sum(pool.map(read, [user] * threads))
+            elapsed = time.perf_counter() - start
+        print(f'threads={threads}: {reads / elapsed / 1e6:.2f}M reads/s')
+
+
+if __name__ == '__main__':
+    main()
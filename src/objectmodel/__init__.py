@@ -2,7 +2,8 @@ from objectmodel.base import FieldABC, ObjectModelABC
 from objectmodel.errors import (
     FieldValidationError,
     DuplicateFieldDefinitionError,
-    FieldValueRequiredError
+    FieldValueRequiredError,
+    RecordStoreSchemaError
 )
 
 from objectmodel.model import ObjectModel, ObjectModelMeta
@@ -14,6 +15,9 @@ from objectmodel.fields import (
     ListCollectionField,
     DictCollectionField
 )
+from objectmodel.indexes import IndexedList, IndexedDict
+from objectmodel.graph import serialize_graph, deserialize_graph
+from objectmodel.store import RecordStore, RecordView
 from ._version import __version__, __version_info__
 
 __all__ = [
@@ -23,7 +27,15 @@ __all__ = [
     'ListCollectionField',
     'DictCollectionField',
     'ProxyField',
+    'ObjectField',
     'FieldValidationError',
     'DuplicateFieldDefinitionError',
-    'FieldValueRequiredError'
+    'FieldValueRequiredError',
+    'RecordStoreSchemaError',
+    'IndexedList',
+    'IndexedDict',
+    'serialize_graph',
+    'deserialize_graph',
+    'RecordStore',
+    'RecordView'
 ]
@@ -1,4 +1,4 @@
-from typing import Any, Type, Optional, Dict, TypeVar
+from typing import Any, Type, Optional, Dict, TypeVar, Set, List
 
 
 __all__ = ['FieldABC', 'ObjectModelABC']
@@ -10,6 +10,7 @@ T = TypeVar('T')
 class FieldABC:
     name: str
     required: bool
+    type_checker: Optional[Any]
 
     def __get__(self, instance: 'ObjectModelABC', owner: Type['ObjectModelABC']) -> T:
         raise NotImplementedError
@@ -23,12 +24,24 @@ class FieldABC:
     def __delete__(self, instance):
         raise NotImplementedError
 
+    def peek(self, instance: 'ObjectModelABC') -> T:
+        raise NotImplementedError
+
     def serialize(self, instance: 'ObjectModelABC') -> Any:
         raise NotImplementedError
 
     def deserialize(self, instance: 'ObjectModelABC', value):
         raise NotImplementedError
 
+    def serialize_graph(self, instance: 'ObjectModelABC', encoder) -> Any:
+        raise NotImplementedError
+
+    def deserialize_graph(self, instance: 'ObjectModelABC', value, decoder):
+        raise NotImplementedError
+
+    def link(self, instance: 'ObjectModelABC', value: T):
+        raise NotImplementedError
+
     def has_default(self) -> bool:
         raise NotImplementedError
 
@@ -44,9 +57,15 @@ class FieldABC:
     def clear(self, instance):
         raise NotImplementedError
 
+    def clone_value(self, value: T, copy_on_write: bool = False, memo: Optional[dict] = None) -> T:
+        raise NotImplementedError
+
 
 class ObjectModelABC:
     __state__: Dict[str, Any]
+    __shared__: Optional[Set[str]]
+    __observers__: Optional[List[Any]]
+    __lock__: Optional[Any]
 
     def serialize(self) -> Dict[str, Any]:
         raise NotImplementedError
@@ -58,3 +77,6 @@ class ObjectModelABC:
     def validate(self):
         raise NotImplementedError
 
+    def clone(self, copy_on_write: bool = False, memo: Optional[dict] = None) -> 'ObjectModelABC':
+        raise NotImplementedError
+
@@ -6,7 +6,8 @@ from objectmodel.base import ObjectModelABC, FieldABC
 __all__ = [
     'FieldValidationError',
     'FieldValueRequiredError',
-    'DuplicateFieldDefinitionError'
+    'DuplicateFieldDefinitionError',
+    'RecordStoreSchemaError'
 ]
 
 
@@ -29,3 +30,9 @@ class DuplicateFieldDefinitionError(AttributeError):
     def __init__(self, field_name: str, class_name: str):
         super().__init__(f'Duplicate field definition found during {class_name} initialization, '
                          f'field: {field_name}')
+
+
+class RecordStoreSchemaError(ValueError):
+    """ Record store file does not match the model schema """
+    def __init__(self, path: str, message: str):
+        super().__init__(f'Invalid record store {path!r}: {message}')
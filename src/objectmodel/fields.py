@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-import sys
+import copy
 
-from typing import Any, TypeVar, Type, Union, Optional, Callable
+from contextlib import nullcontext
+from typing import Any, TypeVar, Type, Union, Optional, Callable, Tuple, TYPE_CHECKING
 
 from objectmodel.base import ObjectModelABC, FieldABC
 from objectmodel.errors import FieldValidationError, FieldValueRequiredError
+from objectmodel.indexes import IndexedList, IndexedDict
+from objectmodel.registry import resolve_model
+
+if TYPE_CHECKING:
+    from objectmodel.graph import GraphEncoder, GraphDecoder
 
 
 __all__ = [
@@ -33,11 +39,14 @@ class _NotProvided:
 
 NOT_PROVIDED = _NotProvided()
 
+# Stands in for the per-instance lock of models that are not thread-safe
+_NO_LOCK = nullcontext()
+
 T = TypeVar('T')
 
 
 class Field(FieldABC):
-    __slots__ = 'name', 'default', 'required', 'allow_none', 'validator'
+    __slots__ = 'name', 'default', 'required', 'allow_none', 'validator', 'type_checker'
 
     def __init__(self,
                  name: str = NOT_PROVIDED,
@@ -52,28 +61,99 @@ class Field(FieldABC):
         self.required = required
         self.allow_none = allow_none
         self.validator = validator
+        # Compiled from the field annotation in ObjectModelMeta
+        self.type_checker = None
 
         # Defaults also should be validated!
-        if not callable(default):
+        if default is not NOT_PROVIDED and not callable(default):
             self.validate(None, default)
 
     def __get__(self, instance: ObjectModelABC, owner: Type[ObjectModelABC]) -> T:
         assert isinstance(instance, ObjectModelABC)
+        try:
+            value = instance.__state__[self.name]
+        except KeyError:
+            if self.default is not NOT_PROVIDED:
+                return self._publish_default(instance)
+            raise FieldValueRequiredError(instance, self)
+
+        shared = instance.__shared__
+        if shared and self.name in shared:
+            return self._unshare(instance)
+        return value
+
+    def _publish_default(self, instance: ObjectModelABC) -> T:
+        default = self.default
+        if callable(default):
+            default = default()
+        default = self._prepare_value(default)
+        self.validate(instance, default)
+        # setdefault is atomic, so concurrent readers materializing the default
+        # all get the same value, even if the factory was called more than once
+        value = instance.__state__.setdefault(self.name, default)
+        if value is default:
+            self._notify_observers(instance)
+        return value
+
+    def _unshare(self, instance: ObjectModelABC) -> T:
+        # Value is shared with a copy-on-write clone, take a private copy
+        # before handing it out since the caller might mutate it
+        with instance.__lock__ or _NO_LOCK:
+            value = instance.__state__[self.name]
+            shared = instance.__shared__
+            # Check again under the lock, a concurrent write might have replaced the value
+            if shared and self.name in shared:
+                value = self.clone_value(value, copy_on_write=True)
+                instance.__state__[self.name] = value
+                shared.discard(self.name)
+            return value
+
+    def peek(self, instance: ObjectModelABC) -> T:
+        """ Reads the value for read-only use (serialization, validation).
+        Unlike attribute access, it does not copy values shared with copy-on-write clones """
         try:
             return instance.__state__[self.name]
         except KeyError:
             if self.default is not NOT_PROVIDED:
-                default = self.default
-                if callable(default):
-                    default = default()
-                self.__set__(instance, default)
-                return default
-        raise FieldValueRequiredError(instance, self)
+                return self._publish_default(instance)
+            raise FieldValueRequiredError(instance, self)
+
+    def _prepare_value(self, value: Any) -> T:
+        return value
+
+    def _notify_observers(self, instance: ObjectModelABC):
+        observers = instance.__observers__
+        if observers:
+            dead = False
+            for ref in observers:
+                observer = ref()
+                if observer is None:
+                    dead = True
+                else:
+                    observer.field_changed(instance, self)
+            if dead:
+                # Indexes of collections that were garbage collected
+                instance.__observers__ = [ref for ref in observers if ref() is not None] or None
 
     def __set__(self, instance: ObjectModelABC, value: T):
         assert isinstance(instance, ObjectModelABC)
+        value = self._prepare_value(value)
         self.validate(instance, value)
-        instance.__state__[self.name] = value
+        self._write(instance, value)
+
+    def link(self, instance: ObjectModelABC, value: T):
+        """ Assigns a reference restored from a graph of models. Same as assignment,
+        except that referenced models are not validated recursively, since graphs may be cyclic """
+        value = self._prepare_value(value)
+        self._check_value(instance, value)
+        self._write(instance, value)
+
+    def _write(self, instance: ObjectModelABC, value: T):
+        with instance.__lock__ or _NO_LOCK:
+            instance.__state__[self.name] = value
+            if instance.__shared__:
+                instance.__shared__.discard(self.name)
+            self._notify_observers(instance)
 
     def __set_name__(self, owner, name):
         if self.name is NOT_PROVIDED:
@@ -84,14 +164,24 @@ class Field(FieldABC):
         assert isinstance(instance, ObjectModelABC)
         if self.required:
             raise FieldValueRequiredError(instance, self)
-        del instance.__state__[self.name]
+        with instance.__lock__ or _NO_LOCK:
+            del instance.__state__[self.name]
+            if instance.__shared__:
+                instance.__shared__.discard(self.name)
+            self._notify_observers(instance)
 
     def serialize(self, instance: ObjectModelABC) -> Any:
-        return self.__get__(instance, instance.__class__)
+        return self.peek(instance)
 
     def deserialize(self, instance: ObjectModelABC, value):
         self.__set__(instance, value)
 
+    def serialize_graph(self, instance: ObjectModelABC, encoder: GraphEncoder) -> Any:
+        return self.serialize(instance)
+
+    def deserialize_graph(self, instance: ObjectModelABC, value, decoder: GraphDecoder):
+        self.deserialize(instance, value)
+
     def has_default(self) -> bool:
         return self.default is not NOT_PROVIDED
 
@@ -102,16 +192,27 @@ class Field(FieldABC):
         return self.default is not NOT_PROVIDED or self.name in instance.__state__
 
     def validate(self, model_instance: Optional[ObjectModelABC], value: T):
-        if value is None and not self.allow_none:
-            raise FieldValidationError(model_instance, self, value,
-                                       'Cannot be None (allow_none=False)')
+        self._check_value(model_instance, value)
         if self.validator:
             value = self.__get__(model_instance, model_instance.__class__)
             self.validator(model_instance, self, value)
 
+    def _check_value(self, model_instance: Optional[ObjectModelABC], value: T):
+        if value is None and not self.allow_none:
+            raise FieldValidationError(model_instance, self, value,
+                                       'Cannot be None (allow_none=False)')
+        if value is not None and self.type_checker is not None and not self.type_checker.check(value):
+            raise FieldValidationError(model_instance, self, value,
+                                       f'Value should be of type: {self.type_checker.type_name}')
+
     def clear(self, instance):
         self.__delete__(instance)
 
+    def clone_value(self, value: T, copy_on_write: bool = False, memo: Optional[dict] = None) -> T:
+        if isinstance(value, ObjectModelABC):
+            return value.clone(copy_on_write=copy_on_write, memo=memo)
+        return copy.deepcopy(value, memo)
+
     def __repr__(self):
         return '{}(name={!r}, default={!r}, required={!r}, allow_none={!r}, validator={!r})'\
             .format(
@@ -132,6 +233,9 @@ class ProxyField(Field):
     def __get__(self, instance, owner):
         return getattr(instance, self._attr_name)
 
+    def peek(self, instance: ObjectModelABC):
+        return self.__get__(instance, instance.__class__)
+
     def has_value(self, instance: ObjectModelABC) -> bool:
         return True
 
@@ -156,6 +260,16 @@ class ObjectField(Field):
             obj.deserialize(value)
             super().deserialize(instance, obj)
 
+    def serialize_graph(self, instance: ObjectModelABC, encoder: GraphEncoder) -> Any:
+        value = self.peek(instance)
+        if value is not None:
+            return encoder.ref(value)
+        return None
+
+    def deserialize_graph(self, instance: ObjectModelABC, value, decoder: GraphDecoder):
+        if value is not None:
+            decoder.link(instance, self, decoder.resolve(value, self._model))
+
     def validate(self, model_instance: ObjectModelABC, value):
         super().validate(model_instance, value)
         if not self.allow_none and value is not None:
@@ -165,12 +279,37 @@ class ObjectField(Field):
             value.validate()
 
 
+def _check_index_on(index_on: Optional[Tuple[str, ...]], item_model: Type[ObjectModelABC]):
+    unknown = [name for name in index_on or () if name not in item_model.__fields__]
+    if unknown:
+        raise ValueError(f'Cant index on {unknown}, no such fields in {item_model.__name__}')
+
+
 class ListCollectionField(Field):
-    __slots__ = '_model'
+    __slots__ = '_model', '_index_on', '_owner_module', '_owner_qualname'
 
-    def __init__(self, item_model: Union[str, Type[ObjectModelABC]], *args, **kwargs):
+    def __init__(self, item_model: Union[str, Type[ObjectModelABC]], *args,
+                 index_on: Optional[Tuple[str, ...]] = None, **kwargs):
         super().__init__(*args, **kwargs)
         self._model = item_model
+        self._index_on = tuple(index_on) if index_on else None
+        self._owner_module = None
+        self._owner_qualname = None
+        # Models referenced by name are checked once resolved
+        if isinstance(item_model, type):
+            _check_index_on(self._index_on, item_model)
+
+    def __set_name__(self, owner, name):
+        super().__set_name__(owner, name)
+        self._owner_module = owner.__module__
+        self._owner_qualname = owner.__qualname__
+
+    def _prepare_value(self, value):
+        if self._index_on and isinstance(value, list):
+            self._resolve_item_type()
+            if not isinstance(value, IndexedList) or value.index_on != self._index_on:
+                return IndexedList(self._index_on, value)
+        return value
 
     def serialize(self, instance: ObjectModelABC) -> Any:
         value = super().serialize(instance)
@@ -185,14 +324,31 @@ class ListCollectionField(Field):
             deserialized_list.append(obj)
         super().deserialize(instance, deserialized_list)
 
+    def serialize_graph(self, instance: ObjectModelABC, encoder: GraphEncoder) -> Any:
+        value = self.peek(instance)
+        return [encoder.ref(v) for v in value]
+
+    def deserialize_graph(self, instance: ObjectModelABC, value, decoder: GraphDecoder):
+        item_cls = self._resolve_item_type()
+        decoder.link(instance, self, [decoder.resolve(v, item_cls) for v in value])
+
     def _resolve_item_type(self) -> Type[ObjectModelABC]:
-        if issubclass(self._model, ObjectModelABC):
-            return self._model
-        elif isinstance(self._model, str):
-            self._model = getattr(sys.modules[__name__], self._model)
+        if isinstance(self._model, str):
+            model = resolve_model(self._model, self._owner_module, self._owner_qualname)
+            _check_index_on(self._index_on, model)
+            self._model = model
+        if isinstance(self._model, type) and issubclass(self._model, ObjectModelABC):
             return self._model
         raise TypeError(f'Cant resolve item model type: {self._model}')
 
+    def clone_value(self, value, copy_on_write: bool = False, memo: Optional[dict] = None):
+        if value is None:
+            return None
+        cloned_list = [item.clone(copy_on_write=copy_on_write, memo=memo) for item in value]
+        if self._index_on:
+            return IndexedList(self._index_on, cloned_list)
+        return cloned_list
+
     def validate(self, model_instance: ObjectModelABC, value):
         super().validate(model_instance, value)
         if not self.allow_none and value is not None:
@@ -208,14 +364,23 @@ class ListCollectionField(Field):
 
 
 class DictCollectionField(Field):
-    __slots__ = '_model', '_dict_factory'
+    __slots__ = '_model', '_dict_factory', '_index_on'
 
     def __init__(self, name: str, item_model: type, dict_factory: callable = dict,
-                 *args, **kwargs):
+                 *args, index_on: Optional[Tuple[str, ...]] = None, **kwargs):
         super().__init__(name, *args, **kwargs)
         assert issubclass(item_model, ObjectModelABC)
         self._model = item_model
         self._dict_factory = dict_factory
+        self._index_on = tuple(index_on) if index_on else None
+        _check_index_on(self._index_on, item_model)
+
+    def _prepare_value(self, value):
+        # Indexed collections replace dict_factory since they need to intercept mutations
+        if self._index_on and isinstance(value, dict):
+            if not isinstance(value, IndexedDict) or value.index_on != self._index_on:
+                return IndexedDict(self._index_on, value)
+        return value
 
     def serialize(self, instance: ObjectModelABC) -> Any:
         value = super().serialize(instance)
@@ -229,6 +394,26 @@ class DictCollectionField(Field):
             deserialized_dict[k] = obj
         super().deserialize(instance, deserialized_dict)
 
+    def serialize_graph(self, instance: ObjectModelABC, encoder: GraphEncoder) -> Any:
+        value = self.peek(instance)
+        return {k: encoder.ref(v) for k, v in value.items()}
+
+    def deserialize_graph(self, instance: ObjectModelABC, value, decoder: GraphDecoder):
+        deserialized_dict = self._dict_factory()
+        for k, v in value.items():
+            deserialized_dict[k] = decoder.resolve(v, self._model)
+        decoder.link(instance, self, deserialized_dict)
+
+    def clone_value(self, value, copy_on_write: bool = False, memo: Optional[dict] = None):
+        if value is None:
+            return None
+        cloned_dict = self._dict_factory()
+        for k, v in value.items():
+            cloned_dict[k] = v.clone(copy_on_write=copy_on_write, memo=memo)
+        if self._index_on:
+            return IndexedDict(self._index_on, cloned_dict)
+        return cloned_dict
+
     def validate(self, model_instance: ObjectModelABC, value: Any):
         super().validate(model_instance, value)
         if not isinstance(value, dict):
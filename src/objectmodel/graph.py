@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple, Type
+
+from objectmodel.base import ObjectModelABC, FieldABC
+
+
+__all__ = [
+    'REF_KEY',
+    'OBJECTS_KEY',
+    'GraphEncoder',
+    'GraphDecoder',
+    'serialize_graph',
+    'deserialize_graph'
+]
+
+
+REF_KEY = '$ref'
+OBJECTS_KEY = '$objects'
+
+
+class GraphEncoder:
+    """ Serializes a graph of models into a flat table of objects.
+
+    Every model instance is emitted once, all references to it (including cyclic ones)
+    are replaced with {'$ref': <index in the table>}, the root is always at index 0.
+    Models are processed from a queue instead of recursion, so the depth of the graph
+    is not limited by the recursion limit.
+    """
+
+    def __init__(self):
+        self._ids: Dict[int, int] = {}
+        self._objects: List[Any] = []
+        self._queue: Deque[ObjectModelABC] = deque()
+
+    def ref(self, obj: ObjectModelABC) -> Dict[str, int]:
+        index = self._ids.get(id(obj))
+        if index is None:
+            index = self._ids[id(obj)] = len(self._objects)
+            self._objects.append(None)
+            self._queue.append(obj)
+        return {REF_KEY: index}
+
+    def encode(self, root: ObjectModelABC) -> Dict[str, Any]:
+        self.ref(root)
+        while self._queue:
+            obj = self._queue.popleft()
+            self._objects[self._ids[id(obj)]] = obj.DICT_FACTORY(
+                (field.name, field.serialize_graph(obj, self))
+                for field in obj.__fields__.values()
+                if field.can_provide_value(obj)
+            )
+        return {OBJECTS_KEY: self._objects}
+
+
+class GraphDecoder:
+    """ Restores a graph of models from the table produced by GraphEncoder.
+
+    References are assigned only after all objects got their plain values, through
+    Field.link() which skips recursive validation, since it never terminates on cyclic graphs.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self._objects = data[OBJECTS_KEY]
+        self._instances: Dict[int, ObjectModelABC] = {}
+        self._queue: Deque[Tuple[int, ObjectModelABC]] = deque()
+        self._links: List[Tuple[ObjectModelABC, FieldABC, Any]] = []
+
+    def resolve(self, ref: Dict[str, int], model: Type[ObjectModelABC]) -> ObjectModelABC:
+        index = ref[REF_KEY]
+        obj = self._instances.get(index)
+        if obj is None:
+            obj = self._instances[index] = model._create_empty()
+            self._queue.append((index, obj))
+        return obj
+
+    def link(self, instance: ObjectModelABC, field: FieldABC, value: Any):
+        self._links.append((instance, field, value))
+
+    def decode(self, model: Type[ObjectModelABC]) -> ObjectModelABC:
+        root = self.resolve({REF_KEY: 0}, model)
+        while self._queue:
+            index, obj = self._queue.popleft()
+            fields = obj.__fields__
+            for key, value in self._objects[index].items():
+                field = fields.get(key)
+                if field is not None:
+                    field.deserialize_graph(obj, value, self)
+        for instance, field, value in self._links:
+            field.link(instance, value)
+        for obj in self._instances.values():
+            obj._state_loaded()
+        return root
+
+
+def serialize_graph(obj: ObjectModelABC) -> Dict[str, Any]:
+    """ Serializes a model with shared and cyclic references, see GraphEncoder """
+    return GraphEncoder().encode(obj)
+
+
+def deserialize_graph(model: Type[ObjectModelABC], data: Dict[str, Any]) -> ObjectModelABC:
+    """ Restores a model serialized by serialize_graph, see GraphDecoder """
+    return GraphDecoder(data).decode(model)
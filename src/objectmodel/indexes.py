@@ -0,0 +1,303 @@
+import sys
+import weakref
+
+from typing import Any, Dict, List, Tuple, Optional, Iterable
+
+from objectmodel.base import ObjectModelABC, FieldABC
+
+
+__all__ = [
+    'CollectionIndex',
+    'IndexedList',
+    'IndexedDict'
+]
+
+
+_NOT_INDEXED = object()
+
+
+class CollectionIndex:
+    """ Hash indexes from item field values to items of a collection.
+
+    The index registers a weak reference to itself in `__observers__` of every item
+    it holds, so that assignment to an indexed field of an item re-keys the item in place,
+    while an index of a collection that is no longer used does not stay attached to its items.
+    Items without a value or with an unhashable value for a field are not indexed by it.
+    """
+    __slots__ = 'fields', '_buckets', '_keys', '_counts', '__weakref__'
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        # field -> value -> {id(item): item}, inner dicts preserve insertion order
+        self._buckets: Dict[str, Dict[Any, Dict[int, ObjectModelABC]]] = {f: {} for f in fields}
+        # field -> id(item) -> value the item is currently indexed by
+        self._keys: Dict[str, Dict[int, Any]] = {f: {} for f in fields}
+        # id(item) -> number of occurrences of the item in the collection
+        self._counts: Dict[int, int] = {}
+
+    def add(self, item: ObjectModelABC):
+        item_id = id(item)
+        count = self._counts.get(item_id, 0)
+        if count:
+            self._counts[item_id] = count + 1
+            return
+        # Keys are computed before anything is changed, so a failing item leaves the index intact
+        keys = [(field_name, self._key(field_name, item)) for field_name in self.fields]
+        self._counts[item_id] = 1
+        for field_name, value in keys:
+            self._add_key(field_name, item, value)
+        observers = item.__observers__
+        if observers is None:
+            item.__observers__ = [weakref.ref(self)]
+        else:
+            # Drop references to indexes of collections that were garbage collected
+            observers[:] = [ref for ref in observers if ref() is not None]
+            observers.append(weakref.ref(self))
+
+    def add_all(self, items: List[ObjectModelABC]):
+        """ Adds all items or none of them """
+        added = 0
+        try:
+            for item in items:
+                self.add(item)
+                added += 1
+        except BaseException:
+            for item in items[:added]:
+                self.discard(item)
+            raise
+
+    def discard(self, item: ObjectModelABC):
+        item_id = id(item)
+        count = self._counts.get(item_id, 0)
+        if count > 1:
+            self._counts[item_id] = count - 1
+            return
+        if not count:
+            return
+        del self._counts[item_id]
+        for field_name in self.fields:
+            self._remove_key(field_name, item)
+        observers = item.__observers__
+        observers.remove(weakref.ref(self))
+        if not observers:
+            item.__observers__ = None
+
+    def field_changed(self, item: ObjectModelABC, field: FieldABC):
+        if id(item) not in self._counts:
+            return
+        model_fields = item.__fields__
+        for field_name in self.fields:
+            if model_fields.get(field_name) is field:
+                value = self._key(field_name, item)
+                self._remove_key(field_name, item)
+                self._add_key(field_name, item, value)
+
+    def find(self, field_name: str, value: Any, default: Any = None) -> Any:
+        bucket = self._buckets[field_name].get(value)
+        if not bucket:
+            return default
+        return next(iter(bucket.values()))
+
+    def find_all(self, field_name: str, value: Any) -> List[ObjectModelABC]:
+        bucket = self._buckets[field_name].get(value)
+        if not bucket:
+            return []
+        return list(bucket.values())
+
+    def memory_usage(self) -> int:
+        """ Approximate size of the index structures in bytes (items themselves are not counted) """
+        size = sys.getsizeof(self._counts)
+        for field_name in self.fields:
+            buckets = self._buckets[field_name]
+            size += sys.getsizeof(buckets) + sys.getsizeof(self._keys[field_name])
+            size += sum(sys.getsizeof(bucket) for bucket in buckets.values())
+        return size
+
+    @staticmethod
+    def _key(field_name: str, item: ObjectModelABC) -> Any:
+        try:
+            value = getattr(item, field_name)
+            hash(value)
+        except (AttributeError, TypeError):
+            return _NOT_INDEXED
+        return value
+
+    def _add_key(self, field_name: str, item: ObjectModelABC, value: Any):
+        if value is _NOT_INDEXED:
+            return
+        buckets = self._buckets[field_name]
+        bucket = buckets.get(value)
+        if bucket is None:
+            buckets[value] = bucket = {}
+        bucket[id(item)] = item
+        self._keys[field_name][id(item)] = value
+
+    def _remove_key(self, field_name: str, item: ObjectModelABC):
+        item_id = id(item)
+        try:
+            value = self._keys[field_name].pop(item_id)
+        except KeyError:
+            return
+        buckets = self._buckets[field_name]
+        bucket = buckets[value]
+        del bucket[item_id]
+        if not bucket:
+            del buckets[value]
+
+
+class _IndexedCollection:
+    __slots__ = ()
+
+    _index: CollectionIndex
+
+    @property
+    def index_on(self) -> Tuple[str, ...]:
+        return self._index.fields
+
+    def find(self, field_name: str, value: Any, default: Any = None) -> Any:
+        """ Returns the first item which field equals value in O(1) """
+        return self._index.find(field_name, value, default)
+
+    def find_all(self, field_name: str, value: Any) -> List[ObjectModelABC]:
+        """ Returns all items which field equals value in O(1) (plus the size of the result) """
+        return self._index.find_all(field_name, value)
+
+    def index_memory_usage(self) -> int:
+        return self._index.memory_usage()
+
+
+class IndexedList(_IndexedCollection, list):
+    """ List of models maintaining hash indexes over the given item fields """
+    __slots__ = '_index',
+
+    def __init__(self, index_on: Tuple[str, ...], items: Iterable[ObjectModelABC] = ()):
+        super().__init__(items)
+        self._index = CollectionIndex(tuple(index_on))
+        for item in self:
+            self._index.add(item)
+
+    def __reduce__(self):
+        return self.__class__, (self._index.fields, list(self))
+
+    def append(self, item: ObjectModelABC):
+        self._index.add(item)
+        super().append(item)
+
+    def extend(self, items: Iterable[ObjectModelABC]):
+        items = list(items)
+        self._index.add_all(items)
+        super().extend(items)
+
+    def insert(self, i: int, item: ObjectModelABC):
+        self._index.add(item)
+        super().insert(i, item)
+
+    def remove(self, item: ObjectModelABC):
+        super().remove(item)
+        self._index.discard(item)
+
+    def pop(self, i: int = -1) -> ObjectModelABC:
+        item = super().pop(i)
+        self._index.discard(item)
+        return item
+
+    def clear(self):
+        for item in self:
+            self._index.discard(item)
+        super().clear()
+
+    def __setitem__(self, key, value):
+        old = self[key]
+        if isinstance(key, slice):
+            value = list(value)
+            self._index.add_all(value)
+            try:
+                super().__setitem__(key, value)
+            except BaseException:
+                for item in value:
+                    self._index.discard(item)
+                raise
+            for item in old:
+                self._index.discard(item)
+        else:
+            self._index.add(value)
+            super().__setitem__(key, value)
+            self._index.discard(old)
+
+    def __delitem__(self, key):
+        old = self[key]
+        super().__delitem__(key)
+        if isinstance(key, slice):
+            for item in old:
+                self._index.discard(item)
+        else:
+            self._index.discard(old)
+
+    def __iadd__(self, items: Iterable[ObjectModelABC]):
+        self.extend(items)
+        return self
+
+    def __imul__(self, n: int):
+        items = list(self)
+        for _ in range(max(n, 1) - 1):
+            self._index.add_all(items)
+        if n <= 0:
+            for item in items:
+                self._index.discard(item)
+        super().__imul__(n)
+        return self
+
+
+class IndexedDict(_IndexedCollection, dict):
+    """ Dict of models maintaining hash indexes over the given fields of its values """
+    __slots__ = '_index',
+
+    def __init__(self, index_on: Tuple[str, ...], *args, **kwargs):
+        super().__init__()
+        self._index = CollectionIndex(tuple(index_on))
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return self.__class__, (self._index.fields, dict(self))
+
+    def __setitem__(self, key, value: ObjectModelABC):
+        old = self.get(key)
+        self._index.add(value)
+        super().__setitem__(key, value)
+        if old is not None:
+            self._index.discard(old)
+
+    def __delitem__(self, key):
+        old = self[key]
+        super().__delitem__(key)
+        self._index.discard(old)
+
+    def pop(self, key, *args) -> Optional[ObjectModelABC]:
+        if key in self:
+            value = super().pop(key)
+            self._index.discard(value)
+            return value
+        return super().pop(key, *args)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._index.discard(value)
+        return key, value
+
+    def setdefault(self, key, default: ObjectModelABC = None) -> ObjectModelABC:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        for value in self.values():
+            self._index.discard(value)
+        super().clear()
@@ -1,6 +1,10 @@
-from typing import Any, Dict
+from threading import RLock
+from typing import Any, Dict, Optional
 
 from objectmodel.base import FieldABC, ObjectModelABC
+from objectmodel.fields import NOT_PROVIDED, _NO_LOCK
+from objectmodel.registry import register_model
+from objectmodel.typecheck import compile_type_checker
 
 
 __all__ = [
@@ -16,6 +20,11 @@ def is_instance_or_subclass(val, klass) -> bool:
         return isinstance(val, klass)
 
 
+# Values of these types can never be mutated in place,
+# so there is no need to track them in copy-on-write clones
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, complex, type(None), frozenset)
+
+
 def _iter_fields(attrs: Dict[str, Any], field_class: type = FieldABC):
     for attr_name, attr in attrs.items():
         if is_instance_or_subclass(attr, field_class):
@@ -34,6 +43,18 @@ class ObjectModelMeta(type):
             del attrs[field_name]"""
 
         cls = super().__new__(mcs, name, bases, attrs)
+        register_model(cls)
+
+        # Registered first, so that annotations can reference the model itself
+        annotations = attrs.get('__annotations__', {})
+        for field_name, field in cls_fields.items():
+            if field_name in annotations and isinstance(field, FieldABC):
+                field.type_checker = compile_type_checker(annotations[field_name],
+                                                          cls.__module__, cls.__qualname__)
+                # Defaults were validated by the field before the type was known
+                default = getattr(field, 'default', NOT_PROVIDED)
+                if default is not NOT_PROVIDED and not callable(default):
+                    field.validate(None, default)
 
         # TODO: Use MRO instead of iteration over base classes?
         for base in bases:
@@ -48,26 +69,60 @@ class ObjectModelMeta(type):
 class ObjectModel(ObjectModelABC, metaclass=ObjectModelMeta):
     DICT_FACTORY = dict
 
-    __slots__ = '__state__'
+    # Thread-safe models resolve defaults at construction, so that reads never write,
+    # and serialize writes with a per-instance lock (`__lock__`), reads stay lock-free
+    THREAD_SAFE = False
+
+    __slots__ = '__state__', '__shared__', '__observers__', '__lock__'
 
     # fields class attr is set during class construction in ObjectModelMeta.__new__
     __fields__: Dict[str, FieldABC]
 
     def __init__(self, **kwargs):
-        self.__state__ = {}
+        self._init_internals()
         for attr_name, attr_value in kwargs.items():
             if attr_name not in self.__fields__:
                 raise AttributeError(f'Unexpected argument: {attr_name}, '
                                      f'no such field in model {self.__class__.__name__}')
             setattr(self, attr_name, attr_value)
 
+        if self.THREAD_SAFE:
+            self.resolve_defaults()
+
         # TODO: Fix double validation (first one happens in the settattr)
         self.validate()
 
+    @classmethod
+    def _create_empty(cls) -> 'ObjectModel':
+        # Bypasses __init__ (and its validation) for instances
+        # which state is going to be populated right after
+        # (the caller is responsible for calling _state_loaded() after that)
+        obj = cls.__new__(cls)
+        obj._init_internals()
+        return obj
+
+    def _state_loaded(self):
+        # Instances created bypassing __init__ need the same defaults
+        # resolution as constructed ones, so that reads of thread-safe models never write
+        if self.THREAD_SAFE:
+            self.resolve_defaults()
+
+    def _init_internals(self):
+        self.__state__ = {}
+        self.__shared__ = None
+        self.__observers__ = None
+        self.__lock__ = RLock() if self.THREAD_SAFE else None
+
+    def resolve_defaults(self):
+        """ Materializes default values of all fields that are not set yet """
+        for field in self.__fields__.values():
+            if field.has_default() and not field.has_value(self):
+                field.__get__(self, self.__class__)
+
     def validate(self):
         for field in self.__fields__.values():
             if field.has_value(self) or field.required:
-                value = field.__get__(self, self.__class__)
+                value = field.peek(self)
                 field.validate(self, value)
 
     def deserialize(self, data: Dict[str, Any]):
@@ -90,8 +145,58 @@ class ObjectModel(ObjectModelABC, metaclass=ObjectModelMeta):
         for field in self.__fields__.values():
             field.clear(self)
 
+    def clone(self, copy_on_write: bool = False, memo: Optional[dict] = None) -> 'ObjectModel':
+        """ Creates a deep copy of the model bypassing serialization and validation.
+
+        With copy_on_write=True only the top-level state is copied. Mutable values
+        (nested models, collections) stay shared between the original and the clone
+        until first access through a field, then the accessing model takes a private copy
+        while the other one keeps the shared value. The clone costs O(fields) and the tree
+        is copied lazily, only where it is touched. Read-only paths (serialize, validate)
+        do not copy.
+
+        References to shared values taken before the clone (e.g. `items = obj.items`)
+        are not isolated: writes through them are visible to every model which has not
+        accessed the field since the clone.
+        """
+        if not copy_on_write:
+            return self._deep_clone({} if memo is None else memo)
+
+        obj = self._create_empty()
+        with self.__lock__ or _NO_LOCK:
+            obj.__state__ = self.__state__.copy()
+            shared = {key for key, value in obj.__state__.items()
+                      if not isinstance(value, _IMMUTABLE_TYPES)}
+            obj.__shared__ = shared
+            if self.__shared__:
+                self.__shared__.update(shared)
+            else:
+                self.__shared__ = set(shared)
+        obj._state_loaded()
+        return obj
+
+    def _deep_clone(self, memo: dict) -> 'ObjectModel':
+        # Memo maps id() of already cloned objects to their clones (as in copy.deepcopy),
+        # so that shared references stay shared and cycles terminate
+        obj = memo.get(id(self))
+        if obj is not None:
+            return obj
+        obj = memo[id(self)] = self._create_empty()
+        state = self.__state__
+        for field in self.__fields__.values():
+            if field.name in state:
+                obj.__state__[field.name] = field.clone_value(state[field.name], memo=memo)
+        obj._state_loaded()
+        return obj
+
+    def __deepcopy__(self, memo):
+        return self.clone(memo=memo)
+
     def __setstate__(self, state: Dict[str, Any]):
+        # __init__ is not called when unpickling
+        self._init_internals()
         self.deserialize(state)
+        self._state_loaded()
 
     def __getstate__(self) -> Dict[str, Any]:
         return self.serialize()
@@ -0,0 +1,38 @@
+from weakref import WeakValueDictionary
+from typing import Optional, Type
+
+from objectmodel.base import ObjectModelABC
+
+
+__all__ = [
+    'register_model',
+    'resolve_model'
+]
+
+
+# Models by their name and fully qualified name, the latest definition wins.
+# Weak references, so that dynamically created models can be garbage collected
+_models: 'WeakValueDictionary[str, Type[ObjectModelABC]]' = WeakValueDictionary()
+
+
+def register_model(cls: Type[ObjectModelABC]):
+    _models[cls.__name__] = cls
+    _models[f'{cls.__module__}.{cls.__qualname__}'] = cls
+
+
+def resolve_model(name: str,
+                  module: Optional[str] = None,
+                  qualname: Optional[str] = None) -> Type[ObjectModelABC]:
+    # Models visible from the referencing scope take precedence over same-named models
+    # from elsewhere: enclosing classes and functions first, then the module level
+    if module is not None:
+        scope = qualname.split('.') if qualname else []
+        for depth in range(len(scope), -1, -1):
+            try:
+                return _models['.'.join((module, *scope[:depth], name))]
+            except KeyError:
+                pass
+    try:
+        return _models[name]
+    except KeyError:
+        raise NameError(f'Unable to resolve model {name!r}, no such model is defined') from None
@@ -0,0 +1,326 @@
+import os
+import mmap
+import pickle
+import struct
+
+from typing import Any, Iterable, Iterator, Type
+
+from objectmodel.errors import RecordStoreSchemaError
+from objectmodel.model import ObjectModel
+
+
+__all__ = [
+    'RecordStore',
+    'RecordView'
+]
+
+
+# File layout:
+#   header:  magic, version, schema length, schema (field names separated by \n)
+#   records: uint32 record length, uint32 end offset per schema field, field payloads
+#
+# A field payload is the pickled result of Field.serialize(), empty payload means
+# that the field had no value set (defaults are not materialized into the stored
+# object and are not stored). The index file next to the data file holds
+# a uint64 offset of every record in the data file.
+_MAGIC = b'OMRS'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHI')
+_LENGTH = struct.Struct('<I')
+_OFFSET = struct.Struct('<Q')
+_INDEX_SUFFIX = '.idx'
+
+# Fixed protocol, so that files stay readable across python versions
+_PICKLE_PROTOCOL = 4
+
+
+class RecordView:
+    """ Read-only view of a single stored record.
+
+    Holds a zero-copy slice of the memory-mapped data file,
+    fields are decoded lazily one by one on access.
+    Fields that had no value set when the record was appended are missing
+    from the view, to_model() restores them as defaults.
+    """
+    __slots__ = '_store', '_buffer'
+
+    def __init__(self, store: 'RecordStore', buffer: memoryview):
+        self._store = store
+        self._buffer = buffer
+
+    def _field_data(self, field_name: str) -> memoryview:
+        position = self._store._positions[field_name]
+        buffer = self._buffer
+        end = _LENGTH.unpack_from(buffer, position * _LENGTH.size)[0]
+        if position:
+            start = _LENGTH.unpack_from(buffer, (position - 1) * _LENGTH.size)[0]
+        else:
+            start = 0
+        table_size = self._store._table.size
+        return buffer[table_size + start:table_size + end]
+
+    def __getitem__(self, field_name: str) -> Any:
+        data = self._field_data(field_name)
+        if not data:
+            raise KeyError(field_name)
+        return pickle.loads(data)
+
+    def __contains__(self, field_name: str) -> bool:
+        return field_name in self._store._positions and bool(self._field_data(field_name))
+
+    def get(self, field_name: str, default: Any = None) -> Any:
+        try:
+            return self[field_name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [name for name in self._store._positions if name in self]
+
+    def to_dict(self):
+        return {name: self[name] for name in self.keys()}
+
+    def to_model(self) -> ObjectModel:
+        obj = self._store.model._create_empty()
+        obj.deserialize(self.to_dict())
+        obj._state_loaded()
+        return obj
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self._store.model.__name__)
+
+
+class RecordStore:
+    """ Append-only file-backed store of records of a single model type.
+
+    Records are length-prefixed binary blobs laid out according to the model
+    schema in `__fields__`. Both the data and the offset index files are memory-mapped,
+    so random access to record #N is O(1) and reading a single field
+    of a record does not decode the rest of it.
+
+    Field values are stored with pickle. Unpickling can execute arbitrary code,
+    so only open files that come from a trusted source.
+    """
+
+    def __init__(self, model: Type[ObjectModel], path: str):
+        self.model = model
+        self.path = path
+        self._fields = tuple(model.__fields__.items())
+        self._positions = {name: i for i, (name, _) in enumerate(self._fields)}
+        self._table = struct.Struct('<{}I'.format(len(self._fields)))
+
+        self._data_file = None
+        self._index_file = None
+        self._data_map = None
+        self._data_view = None
+        self._index_map = None
+        self._stale = True
+        self._count = 0
+        self._data_size = 0
+        self._header_size = 0
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        schema = '\n'.join(self._positions).encode('utf-8')
+        self._data_file = open(self.path, 'ab')
+        if self._data_file.tell() == 0:
+            self._data_file.write(_HEADER.pack(_MAGIC, _VERSION, len(schema)))
+            self._data_file.write(schema)
+            self._data_file.flush()
+        self._data_size = self._data_file.tell()
+
+        with open(self.path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise RecordStoreSchemaError(self.path, 'truncated header')
+            magic, version, schema_len = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise RecordStoreSchemaError(self.path, 'not a record store file')
+            if version != _VERSION:
+                raise RecordStoreSchemaError(self.path, f'unsupported version {version}')
+            stored_schema = f.read(schema_len)
+        if stored_schema != schema:
+            stored_fields = stored_schema.decode('utf-8').split('\n')
+            raise RecordStoreSchemaError(
+                self.path,
+                f'stored fields {stored_fields} '
+                f'do not match fields of {self.model.__name__}: {list(self._positions)}')
+        self._header_size = _HEADER.size + schema_len
+
+        index_path = self.path + _INDEX_SUFFIX
+        index_size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+        if index_size % _OFFSET.size:
+            # Drop partially written entry
+            index_size -= index_size % _OFFSET.size
+            os.truncate(index_path, index_size)
+        self._index_file = open(index_path, 'ab')
+        self._count = index_size // _OFFSET.size
+        self._sync_index()
+
+    def _sync_index(self):
+        # Data is always written before the index,
+        # so the index might only lag behind, never run ahead
+        self._remap()
+        if self._count:
+            position = self._offset(self._count - 1)
+            position += _LENGTH.size + _LENGTH.unpack_from(self._data_map, position)[0]
+        else:
+            position = self._header_size
+
+        offsets = []
+        while position + _LENGTH.size <= self._data_size:
+            offsets.append(position)
+            position += _LENGTH.size + _LENGTH.unpack_from(self._data_map, position)[0]
+        if position != self._data_size:
+            raise RecordStoreSchemaError(self.path, 'truncated record at the end of the file')
+
+        if offsets:
+            self._index_file.write(struct.pack('<{}Q'.format(len(offsets)), *offsets))
+            self._index_file.flush()
+            self._count += len(offsets)
+            self._stale = True
+
+    def _remap(self):
+        # Views handed out earlier keep previous mappings alive on their own
+        with open(self.path, 'rb') as f:
+            self._data_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data_view = memoryview(self._data_map)
+        if self._count:
+            with open(self.path + _INDEX_SUFFIX, 'rb') as f:
+                self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._stale = False
+
+    def _check_open(self):
+        if self._data_file is None:
+            raise ValueError('Record store is closed')
+
+    def _offset(self, index: int) -> int:
+        return _OFFSET.unpack_from(self._index_map, index * _OFFSET.size)[0]
+
+    def _encode(self, obj: ObjectModel) -> bytes:
+        if not isinstance(obj, self.model):
+            raise TypeError(f'Expected instance of {self.model.__name__}, got {obj!r}')
+        ends = []
+        payload = []
+        end = 0
+        for _, field in self._fields:
+            # has_value() and not can_provide_value(), so that appending
+            # does not write defaults into the object
+            if field.has_value(obj):
+                data = pickle.dumps(field.serialize(obj), protocol=_PICKLE_PROTOCOL)
+                payload.append(data)
+                end += len(data)
+            ends.append(end)
+        return b''.join((
+            _LENGTH.pack(self._table.size + end),
+            self._table.pack(*ends),
+            *payload
+        ))
+
+    def append(self, obj: ObjectModel) -> int:
+        """ Appends a record and returns its index """
+        return self.extend((obj, )).start
+
+    def extend(self, objs: Iterable[ObjectModel]) -> range:
+        """ Appends records in bulk with a single write and returns the range of their indices """
+        self._check_open()
+        records = []
+        offsets = []
+        position = self._data_size
+        for obj in objs:
+            record = self._encode(obj)
+            records.append(record)
+            offsets.append(position)
+            position += len(record)
+        start = self._count
+        if records:
+            self._data_file.write(b''.join(records))
+            self._data_file.flush()
+            self._index_file.write(struct.pack('<{}Q'.format(len(offsets)), *offsets))
+            self._index_file.flush()
+            self._data_size = position
+            self._count += len(offsets)
+            self._stale = True
+        return range(start, self._count)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int) -> RecordView:
+        self._check_open()
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Record index out of range')
+        if self._stale:
+            self._remap()
+        offset = self._offset(index)
+        start = offset + _LENGTH.size
+        end = start + _LENGTH.unpack_from(self._data_map, offset)[0]
+        return RecordView(self, self._data_view[start:end])
+
+    def get(self, index: int) -> ObjectModel:
+        """ Fully decodes record #index into a model instance """
+        return self[index].to_model()
+
+    def read_field(self, index: int, field_name: str) -> Any:
+        """ Decodes a single serialized field value of record #index """
+        return self[index][field_name]
+
+    def scan(self, start: int = 0) -> Iterator[RecordView]:
+        """ Sequentially iterates over records starting from record #start """
+        self._check_open()
+        return self._scan(start)
+
+    def _scan(self, start: int) -> Iterator[RecordView]:
+        count = self._count
+        if start >= count:
+            return
+        if self._stale:
+            self._remap()
+        data_map = self._data_map
+        data_view = self._data_view
+        position = self._offset(start)
+        for _ in range(start, count):
+            begin = position + _LENGTH.size
+            position = begin + _LENGTH.unpack_from(data_map, position)[0]
+            yield RecordView(self, data_view[begin:position])
+
+    def iter_field(self, field_name: str, default: Any = None) -> Iterator[Any]:
+        """ Sequentially iterates over values of a single field of all records """
+        if field_name not in self._positions:
+            raise KeyError(field_name)
+        return (view.get(field_name, default) for view in self.scan())
+
+    def __iter__(self) -> Iterator[RecordView]:
+        return self.scan()
+
+    def close(self):
+        if self._data_file is not None:
+            self._data_file.close()
+            self._data_file = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        self._data_map = None
+        self._data_view = None
+        self._index_map = None
+        self._stale = True
+
+    def __enter__(self) -> 'RecordStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return '{}(model={}, path={!r}, records={})'.format(
+            self.__class__.__name__,
+            self.model.__name__,
+            self.path,
+            self._count
+        )
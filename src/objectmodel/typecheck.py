@@ -0,0 +1,290 @@
+import sys
+import types
+import typing
+
+from typing import Any, Callable, Dict, Optional, Union
+
+from objectmodel.registry import resolve_model
+
+
+__all__ = [
+    'TypeChecker',
+    'compile_type_checker'
+]
+
+
+Check = Callable[[Any], bool]
+
+_NONE_TYPE = type(None)
+_LITERAL = getattr(typing, 'Literal', None)
+_UNION_TYPE = getattr(types, 'UnionType', None)  # X | Y syntax, python 3.10+
+_GENERIC_ALIAS = getattr(types, 'GenericAlias', None)  # list[X] syntax, python 3.9+
+
+# Checkers are shared between all fields with equal annotations
+_cache: Dict[Any, 'TypeChecker'] = {}
+
+
+class TypeChecker:
+    """ isinstance-like check compiled from a type annotation """
+    __slots__ = 'annotation', 'check', 'type_name'
+
+    def __init__(self, annotation: Any, check: Check):
+        self.annotation = annotation
+        self.check = check
+        self.type_name = _type_name(annotation)
+
+    def __call__(self, value: Any) -> bool:
+        return self.check(value)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.type_name})'
+
+
+def compile_type_checker(annotation: Any,
+                         module: Optional[str] = None,
+                         qualname: Optional[str] = None) -> TypeChecker:
+    """ Returns a (cached) checker for the annotation.
+
+    String annotations and forward references are evaluated in the namespace
+    of the module falling back to the model registry (models defined in the scope
+    of `qualname` first). If a name is not defined yet, it is resolved on the first
+    check instead.
+    """
+    namespace = _ModelNamespace(module, qualname)
+    if _has_forward_refs(annotation):
+        # Checkers are cached by the resolved annotation, so that equal annotations
+        # share a checker however they are spelled. Only references to models
+        # which are not defined yet are compiled lazily and not shared
+        try:
+            annotation = _resolve(annotation, namespace)
+        except NameError:
+            pass
+        if _has_forward_refs(annotation):
+            return TypeChecker(annotation, _compile(annotation, namespace))
+    try:
+        return _cache[annotation]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable annotation, e.g. Literal of an unhashable value
+        return TypeChecker(annotation, _compile(annotation, namespace))
+    checker = _cache[annotation] = TypeChecker(annotation, _compile(annotation, namespace))
+    return checker
+
+
+def _has_forward_refs(tp: Any) -> bool:
+    if isinstance(tp, (str, typing.ForwardRef)):
+        return True
+    if _LITERAL is not None and getattr(tp, '__origin__', None) is _LITERAL:
+        return False
+    return any(_has_forward_refs(arg) for arg in getattr(tp, '__args__', None) or ())
+
+
+def _resolve(tp: Any, namespace: '_ModelNamespace') -> Any:
+    """ Replaces forward references in the annotation with the objects they refer to """
+    if isinstance(tp, str):
+        return _resolve(_evaluate(tp, namespace), namespace)
+    if isinstance(tp, typing.ForwardRef):
+        return _resolve(_evaluate(tp.__forward_arg__, namespace), namespace)
+    if not _has_forward_refs(tp):
+        return tp
+    args = tuple(_resolve(arg, namespace) for arg in tp.__args__)
+    if _GENERIC_ALIAS is not None and isinstance(tp, _GENERIC_ALIAS):
+        return _GENERIC_ALIAS(tp.__origin__, args)
+    copy_with = getattr(tp, 'copy_with', None)
+    # Annotations that can not be rebuilt are left unresolved
+    return copy_with(args) if copy_with is not None else tp
+
+
+def _any(value: Any) -> bool:
+    return True
+
+
+def _is_none(value: Any) -> bool:
+    return value is None
+
+
+def _compile(tp: Any, namespace: '_ModelNamespace') -> Check:
+    if isinstance(tp, str):
+        return _compile_forward_ref(tp, namespace)
+    if isinstance(tp, typing.ForwardRef):
+        return _compile_forward_ref(tp.__forward_arg__, namespace)
+    if tp is Any or tp is object or isinstance(tp, typing.TypeVar):
+        return _any
+    if tp is None or tp is _NONE_TYPE:
+        return _is_none
+    if _UNION_TYPE is not None and isinstance(tp, _UNION_TYPE):
+        return _compile_union(tp.__args__, namespace)
+
+    origin = getattr(tp, '__origin__', None)
+    if origin is None:
+        if isinstance(tp, type):
+            return _compile_class(tp)
+        # Not supported annotations are not checked
+        return _any
+
+    # Bare generics (List, Dict) have either no args or TypeVar args, both mean Any
+    args = getattr(tp, '__args__', ())
+    if origin is Union:
+        return _compile_union(args, namespace)
+    if _LITERAL is not None and origin is _LITERAL:
+        return _compile_literal(args)
+    if origin in (list, set, frozenset):
+        return _compile_collection(origin, args[0] if args else Any, namespace)
+    if origin is dict:
+        key_tp, value_tp = args if len(args) == 2 else (Any, Any)
+        return _compile_dict(key_tp, value_tp, namespace)
+    if origin is tuple:
+        return _compile_tuple(args, namespace)
+    if isinstance(origin, type):
+        # Other generics (Sequence[int], Type[X]) are checked only by their origin
+        return _compile_class(origin)
+    return _any
+
+
+def _compile_class(cls: type) -> Check:
+    # int is acceptable where float is expected (PEP 484 numeric tower)
+    classes = (float, int) if cls is float else cls
+
+    def check(value: Any) -> bool:
+        return isinstance(value, classes)
+    return check
+
+
+def _compile_union(args, namespace: '_ModelNamespace') -> Check:
+    classes = []
+    checks = []
+    for arg in args:
+        if arg is Any or isinstance(arg, typing.TypeVar):
+            return _any
+        if isinstance(arg, type) and getattr(arg, '__origin__', None) is None:
+            classes.append(arg)
+            if arg is float:
+                classes.append(int)
+        else:
+            checks.append(_compile(arg, namespace))
+    classes = tuple(classes)
+
+    if not checks:
+        def check(value: Any) -> bool:
+            return isinstance(value, classes)
+        return check
+
+    def check(value: Any) -> bool:
+        if isinstance(value, classes):
+            return True
+        for c in checks:
+            if c(value):
+                return True
+        return False
+    return check
+
+
+def _compile_literal(values) -> Check:
+    def check(value: Any) -> bool:
+        # Type comparison, so that 1 does not match Literal[True]
+        for v in values:
+            if type(value) is type(v) and value == v:
+                return True
+        return False
+    return check
+
+
+def _compile_collection(kind: type, item_tp: Any, namespace: '_ModelNamespace') -> Check:
+    item_check = _compile(item_tp, namespace)
+    if item_check is _any:
+        def check(value: Any) -> bool:
+            return isinstance(value, kind)
+        return check
+
+    def check(value: Any) -> bool:
+        return isinstance(value, kind) and all(map(item_check, value))
+    return check
+
+
+def _compile_dict(key_tp: Any, value_tp: Any, namespace: '_ModelNamespace') -> Check:
+    key_check = _compile(key_tp, namespace)
+    value_check = _compile(value_tp, namespace)
+    if key_check is _any and value_check is _any:
+        def check(value: Any) -> bool:
+            return isinstance(value, dict)
+        return check
+
+    def check(value: Any) -> bool:
+        if not isinstance(value, dict):
+            return False
+        for k, v in value.items():
+            if not key_check(k) or not value_check(v):
+                return False
+        return True
+    return check
+
+
+def _compile_tuple(args, namespace: '_ModelNamespace') -> Check:
+    if not args:
+        def check(value: Any) -> bool:
+            return isinstance(value, tuple)
+        return check
+
+    if len(args) == 2 and args[1] is Ellipsis:
+        return _compile_collection(tuple, args[0], namespace)
+
+    # Tuple[()] is an empty tuple
+    item_checks = [_compile(arg, namespace) for arg in args if arg != ()]
+
+    def check(value: Any) -> bool:
+        if not isinstance(value, tuple) or len(value) != len(item_checks):
+            return False
+        for item_check, item in zip(item_checks, value):
+            if not item_check(item):
+                return False
+        return True
+    return check
+
+
+class _ModelNamespace(dict):
+    """ Lookups of names that are not defined in the module go to the model registry """
+
+    def __init__(self, module: Optional[str], qualname: Optional[str] = None):
+        super().__init__()
+        self.module = module
+        self.qualname = qualname
+        self.module_globals = getattr(sys.modules.get(module), '__dict__', {})
+
+    def __missing__(self, key: str):
+        if key not in self.module_globals:
+            try:
+                return resolve_model(key, self.module, self.qualname)
+            except NameError:
+                pass
+        # Let eval continue the lookup in globals and builtins
+        raise KeyError(key)
+
+
+def _evaluate(expr: str, namespace: _ModelNamespace) -> Any:
+    return eval(expr, namespace.module_globals, namespace)
+
+
+def _compile_forward_ref(expr: str, namespace: _ModelNamespace) -> Check:
+    try:
+        return _compile(_evaluate(expr, namespace), namespace)
+    except NameError:
+        pass
+
+    # Referenced model is not defined yet
+    resolved = None
+
+    def check(value: Any) -> bool:
+        nonlocal resolved
+        if resolved is None:
+            resolved = _compile(_evaluate(expr, namespace), namespace)
+        return resolved(value)
+    return check
+
+
+def _type_name(annotation: Any) -> str:
+    if isinstance(annotation, str):
+        return annotation
+    if isinstance(annotation, type):
+        return annotation.__qualname__
+    return repr(annotation).replace('typing.', '')
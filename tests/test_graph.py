@@ -0,0 +1,91 @@
+import json
+import sys
+
+import pytest
+
+from objectmodel import *
+
+
+class User(ObjectModel):
+    name = Field(required=True)
+    friends = ListCollectionField('User', default=list, index_on=('name', ))
+
+
+class Team(ObjectModel):
+    lead = ObjectField('lead', User)
+    members = DictCollectionField('members', User, default=dict)
+
+
+def test_shared_references_are_serialized_once():
+    alice = User(name='alice')
+    team = Team(lead=alice, members={'a': alice, 'b': User(name='bob')})
+    data = serialize_graph(team)
+
+    objects = data['$objects']
+    assert len(objects) == 3
+    assert objects[0]['lead'] == objects[0]['members']['a'] == {'$ref': 1}
+
+    restored = deserialize_graph(Team, json.loads(json.dumps(data)))
+    assert restored.lead is restored.members['a']
+    assert restored.members['b'].name == 'bob'
+
+
+def test_cycles():
+    alice = User(name='alice')
+    bob = User(name='bob', friends=[alice])
+    alice.friends.append(bob)
+    alice.friends.append(alice)
+
+    data = serialize_graph(alice)
+    assert len(data['$objects']) == 2
+
+    restored = deserialize_graph(User, data)
+    assert restored.name == 'alice'
+    assert restored.friends[1] is restored
+    assert restored.friends[0].friends[0] is restored
+    assert restored.friends.find('name', 'bob') is restored.friends[0]
+
+
+def test_deep_graph_does_not_hit_recursion_limit():
+    depth = sys.getrecursionlimit() * 2
+    root = node = User(name='0')
+    for i in range(1, depth):
+        child = User(name=str(i))
+        node.friends.append(child)
+        node = child
+
+    data = serialize_graph(root)
+    assert len(data['$objects']) == depth
+
+    restored = deserialize_graph(User, data)
+    node = restored
+    for i in range(depth - 1):
+        node = node.friends[0]
+    assert node.name == str(depth - 1)
+
+
+def test_restored_references_are_observed_by_indexes():
+    alice = User(name='alice')
+    bob = User(name='bob', friends=[alice])
+    alice.friends = [bob]
+
+    restored = deserialize_graph(User, serialize_graph(bob))
+    friend = restored.friends.find('name', 'alice')
+    assert friend is restored.friends[0]
+    assert friend.friends[0] is restored
+
+    friend.name = 'alicia'
+    assert restored.friends.find('name', 'alice') is None
+    assert restored.friends.find('name', 'alicia') is friend
+
+
+def test_restored_references_are_type_checked():
+    class Base(ObjectModel):
+        pass
+
+    class Node(ObjectModel):
+        next: 'Node' = ObjectField('next', Base, allow_none=True)
+
+    # The referenced object is restored as Base, which is not a Node
+    with pytest.raises(FieldValidationError):
+        deserialize_graph(Node, {'$objects': [{'next': {'$ref': 1}}, {}]})
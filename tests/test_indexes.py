@@ -0,0 +1,151 @@
+import pickle
+import pytest
+
+from objectmodel import *
+
+
+class User(ObjectModel):
+    id = Field()
+    name = Field()
+
+
+class Group(ObjectModel):
+    users = ListCollectionField(User, default=list, index_on=('id', 'name'))
+    by_key = DictCollectionField('by_key', User, default=dict, index_on=('name', ))
+
+
+def test_list_index_is_maintained():
+    group = Group()
+    alice = User(id=1, name='alice')
+    bob = User(id=2, name='bob')
+    group.users.append(alice)
+    group.users.extend([bob])
+    assert isinstance(group.users, IndexedList)
+    assert group.users.find('id', 1) is alice
+    assert group.users.find('name', 'bob') is bob
+    assert group.users.find('name', 'carol') is None
+
+    group.users.remove(alice)
+    assert group.users.find('id', 1) is None
+
+    carol = User(id=3, name='bob')
+    group.users[0] = carol
+    assert group.users.find_all('name', 'bob') == [carol]
+
+    del group.users[:]
+    assert group.users.find_all('name', 'bob') == []
+    assert carol.__observers__ is None
+
+
+def test_list_assignment_is_indexed():
+    alice = User(id=1, name='alice')
+    group = Group(users=[alice])
+    assert isinstance(group.users, IndexedList)
+    assert group.users.find('id', 1) is alice
+
+
+def test_item_field_change_reindexes():
+    group = Group()
+    alice = User(id=1, name='alice')
+    group.users.append(alice)
+
+    alice.name = 'alicia'
+    assert group.users.find('name', 'alice') is None
+    assert group.users.find('name', 'alicia') is alice
+
+    group.users.pop()
+    alice.name = 'alice'
+    assert group.users.find('name', 'alice') is None
+
+
+def test_duplicate_items():
+    group = Group()
+    alice = User(id=1, name='alice')
+    group.users.extend([alice, alice])
+    group.users.pop()
+    assert group.users.find('id', 1) is alice
+    group.users.pop()
+    assert group.users.find('id', 1) is None
+
+
+def test_dict_index_is_maintained():
+    group = Group()
+    alice = User(id=1, name='alice')
+    group.by_key['a'] = alice
+    assert isinstance(group.by_key, IndexedDict)
+    assert group.by_key.find('name', 'alice') is alice
+
+    bob = User(id=2, name='bob')
+    group.by_key['a'] = bob
+    assert group.by_key.find('name', 'alice') is None
+    assert group.by_key.find('name', 'bob') is bob
+
+    group.by_key.pop('a')
+    assert group.by_key.find('name', 'bob') is None
+
+
+def test_index_memory_usage():
+    group = Group()
+    empty_size = group.users.index_memory_usage()
+    group.users.extend(User(id=i, name=str(i)) for i in range(100))
+    assert group.users.index_memory_usage() > empty_size
+
+
+def test_indexed_collections_survive_clone_and_pickle():
+    group = Group(users=[User(id=1, name='alice')])
+    cloned = group.clone()
+    assert cloned.users.find('id', 1) is cloned.users[0]
+
+    users = pickle.loads(pickle.dumps(group.users))
+    assert users.find('id', 1) is users[0]
+
+
+def test_replaced_collection_index_is_detached():
+    import gc
+
+    alice = User(id=1, name='alice')
+    group = Group(users=[alice])
+    for _ in range(10):
+        group.users = [alice]
+    gc.collect()
+    alice.name = 'alicia'
+    assert len(alice.__observers__) == 1
+    assert group.users.find('name', 'alicia') is alice
+
+    del group.users
+    gc.collect()
+    alice.name = 'alice'
+    assert alice.__observers__ is None
+
+
+def test_unhashable_values_are_not_indexed():
+    group = Group()
+    alice = User(id=1, name=['alice'])
+    group.users.append(alice)
+    assert group.users == [alice]
+    assert group.users.find('id', 1) is alice
+
+    alice.name = 'alice'
+    assert group.users.find('name', 'alice') is alice
+    alice.name = ['alice']
+    assert group.users.find('name', 'alice') is None
+    assert group.users.find('id', 1) is alice
+
+
+def test_failed_slice_assignment_keeps_index():
+    group = Group()
+    alice = User(id=1, name='alice')
+    bob = User(id=2, name='bob')
+    group.users.extend([alice, bob])
+    with pytest.raises(ValueError):
+        group.users[::2] = [User(id=3, name='carol'), User(id=4, name='dave')]
+    assert group.users == [alice, bob]
+    assert group.users.find('id', 3) is None
+    assert group.users.find('id', 1) is alice
+
+
+def test_index_on_unknown_field_raises():
+    with pytest.raises(ValueError):
+        ListCollectionField(User, index_on=('nmae', ))
+    with pytest.raises(ValueError):
+        DictCollectionField('users', User, index_on=('nmae', ))
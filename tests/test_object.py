@@ -115,3 +115,110 @@ def test_not_filled_required_field_raises():
 
     with pytest.raises(FieldValueRequiredError):
         A()
+
+
+def test_clone():
+    class B(ObjectModel):
+        bar = Field()
+
+    class A(ObjectModel):
+        foo = Field()
+        child = ObjectField('child', B)
+        items = ListCollectionField(B, default=list)
+
+    obj = A(foo=42, child=B(bar=1), items=[B(bar=2)])
+    cloned = obj.clone()
+    assert cloned is not obj
+    assert cloned.serialize() == obj.serialize()
+    assert cloned.child is not obj.child
+    assert cloned.items[0] is not obj.items[0]
+
+
+def test_clone_copy_on_write():
+    class B(ObjectModel):
+        bar = Field()
+
+    class A(ObjectModel):
+        child = ObjectField('child', B)
+        items = ListCollectionField(B, default=list)
+
+    obj = A(child=B(bar=1), items=[B(bar=2)])
+    cloned = obj.clone(copy_on_write=True)
+
+    # Nothing is copied until accessed
+    assert cloned.__state__['child'] is obj.__state__['child']
+    assert cloned.__state__['items'] is obj.__state__['items']
+
+    cloned.child.bar = 10
+    cloned.items.append(B(bar=3))
+    assert obj.child.bar == 1
+    assert len(obj.items) == 1
+
+    # Mutations of the original are not visible in the clone either
+    obj.items[0].bar = 20
+    assert cloned.items[0].bar == 2
+    assert cloned.child.bar == 10
+
+
+def test_deepcopy():
+    import copy
+
+    class A(ObjectModel):
+        foo = Field()
+
+    obj = A(foo=[1, 2])
+    copied = copy.deepcopy(obj)
+    copied.foo.append(3)
+    assert obj.foo == [1, 2]
+
+
+def test_clone_keeps_shared_references_and_cycles():
+    import copy
+
+    class Node(ObjectModel):
+        name = Field()
+        parent = Field(default=None, allow_none=True)
+        children = ListCollectionField('Node', default=list)
+
+    root = Node(name='root')
+    child = Node(name='child', parent=root)
+    root.children = [child, child]
+
+    for cloned in (root.clone(), copy.deepcopy(root)):
+        assert cloned is not root
+        assert cloned.children[0] is cloned.children[1]
+        assert cloned.children[0] is not child
+        assert cloned.children[0].parent is cloned
+
+
+def test_copy_on_write_clone_read_only_access_does_not_copy():
+    class B(ObjectModel):
+        bar = Field()
+
+    class A(ObjectModel):
+        child = ObjectField('child', B)
+        items = ListCollectionField(B, default=list)
+
+    obj = A(child=B(bar=1), items=[B(bar=2)])
+    cloned = obj.clone(copy_on_write=True)
+
+    assert cloned.serialize() == obj.serialize()
+    cloned.validate()
+    assert cloned.__state__['child'] is obj.__state__['child']
+    assert cloned.__state__['items'] is obj.__state__['items']
+
+
+def test_copy_on_write_clone_and_references_taken_before_clone():
+    class A(ObjectModel):
+        items = Field()
+
+    obj = A(items=[1])
+    items = obj.items
+    cloned = obj.clone(copy_on_write=True)
+
+    # The clone takes a private copy on first access,
+    # writes through older references are not visible in it afterwards
+    assert cloned.items == [1]
+    items.append(2)
+    assert cloned.items == [1]
+    assert obj.items == [1, 2]
@@ -0,0 +1,93 @@
+import pytest
+
+from objectmodel import *
+
+
+class Item(ObjectModel):
+    id = Field(required=True)
+    name = Field()
+    tags = Field(default=list)
+
+
+def test_append_and_read(tmp_path):
+    path = str(tmp_path / 'items.db')
+    with RecordStore(Item, path) as store:
+        assert store.append(Item(id=1, name='first')) == 0
+        assert store.extend(Item(id=i) for i in range(2, 5)) == range(1, 4)
+        assert len(store) == 4
+
+        assert store.read_field(0, 'name') == 'first'
+        assert store[-1]['id'] == 4
+        assert 'name' not in store[1]
+        assert store[1].get('name') is None
+
+        obj = store.get(0)
+        assert isinstance(obj, Item)
+        assert obj.serialize() == Item(id=1, name='first').serialize()
+
+        with pytest.raises(IndexError):
+            store[4]
+
+
+def test_scan(tmp_path):
+    path = str(tmp_path / 'items.db')
+    with RecordStore(Item, path) as store:
+        store.extend(Item(id=i) for i in range(10))
+        assert [view['id'] for view in store] == list(range(10))
+        assert [view['id'] for view in store.scan(8)] == [8, 9]
+        assert list(store.iter_field('name', default='')) == [''] * 10
+
+
+def test_reopen(tmp_path):
+    path = str(tmp_path / 'items.db')
+    with RecordStore(Item, path) as store:
+        store.extend(Item(id=i) for i in range(3))
+
+    with RecordStore(Item, path) as store:
+        assert len(store) == 3
+        store.append(Item(id=3))
+        assert [view['id'] for view in store] == [0, 1, 2, 3]
+
+
+def test_rebuild_missing_index(tmp_path):
+    path = str(tmp_path / 'items.db')
+    with RecordStore(Item, path) as store:
+        store.extend(Item(id=i) for i in range(3))
+
+    (tmp_path / 'items.db.idx').unlink()
+    with RecordStore(Item, path) as store:
+        assert len(store) == 3
+        assert store[2]['id'] == 2
+
+
+def test_schema_mismatch_raises(tmp_path):
+    class Other(ObjectModel):
+        id = Field()
+
+    path = str(tmp_path / 'items.db')
+    RecordStore(Item, path).close()
+    with pytest.raises(RecordStoreSchemaError):
+        RecordStore(Other, path)
+
+
+def test_append_does_not_materialize_defaults(tmp_path):
+    path = str(tmp_path / 'items.db')
+    with RecordStore(Item, path) as store:
+        obj = Item(id=1)
+        store.append(obj)
+        assert 'tags' not in obj.__state__
+        assert 'tags' not in store[0]
+        assert store.get(0).tags == []
+
+
+def test_closed_store_raises(tmp_path):
+    path = str(tmp_path / 'items.db')
+    store = RecordStore(Item, path)
+    store.append(Item(id=1))
+    store.close()
+
+    for access in (lambda: store[0], lambda: store.get(0), lambda: store.read_field(0, 'id'),
+                   lambda: store.scan(), lambda: store.iter_field('id'),
+                   lambda: store.append(Item(id=2))):
+        with pytest.raises(ValueError):
+            access()
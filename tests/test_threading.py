@@ -0,0 +1,121 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from objectmodel import *
+
+
+THREADS = 8
+
+
+def _read_concurrently(obj, attr):
+    barrier = threading.Barrier(THREADS)
+
+    def read(_):
+        barrier.wait()
+        return getattr(obj, attr)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        return list(pool.map(read, range(THREADS)))
+
+
+def test_concurrent_reads_publish_single_default():
+    counter = itertools.count()
+
+    def generate_id():
+        value = next(counter)
+        # Give other threads a chance to race for the same default
+        time.sleep(0.001)
+        return value
+
+    class A(ObjectModel):
+        id = Field(default=generate_id)
+        items = Field(default=list)
+
+    for _ in range(20):
+        obj = A()
+        ids = _read_concurrently(obj, 'id')
+        assert len(set(ids)) == 1
+        lists = _read_concurrently(obj, 'items')
+        assert all(items is lists[0] for items in lists)
+
+
+def test_thread_safe_model_resolves_defaults_on_init():
+    class A(ObjectModel):
+        THREAD_SAFE = True
+        items = Field(default=list)
+
+    obj = A()
+    assert 'items' in obj.__state__
+    assert obj.__lock__ is not None
+
+
+class ThreadSafeItem(ObjectModel):
+    THREAD_SAFE = True
+
+    id = Field()
+    tags = Field(default=list)
+
+
+def test_thread_safe_model_resolves_defaults_when_created_without_init(tmp_path):
+    import pickle
+
+    obj = ThreadSafeItem(id=1)
+    del obj.tags
+    with RecordStore(ThreadSafeItem, str(tmp_path / 'items.db')) as store:
+        store.append(obj)
+        loaded = [
+            obj.clone(),
+            obj.clone(copy_on_write=True),
+            pickle.loads(pickle.dumps(obj)),
+            deserialize_graph(ThreadSafeItem, serialize_graph(obj)),
+            store.get(0),
+        ]
+    for copied in loaded:
+        assert copied.__state__['tags'] == []
+        assert copied.__lock__ is not None
+
+
+def test_no_lost_updates_with_instance_lock():
+    class A(ObjectModel):
+        THREAD_SAFE = True
+        counter = Field(default=0)
+
+    obj = A()
+
+    def increment(_):
+        for _ in range(100):
+            with obj.__lock__:
+                obj.counter += 1
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(increment, range(THREADS)))
+    assert obj.counter == THREADS * 100
+
+
+def test_copy_on_write_does_not_lose_concurrent_write():
+    unsharing = threading.Event()
+
+    class SlowField(Field):
+        def clone_value(self, value, copy_on_write=False):
+            unsharing.set()
+            time.sleep(0.05)
+            return super().clone_value(value, copy_on_write)
+
+    class A(ObjectModel):
+        THREAD_SAFE = True
+        foo = SlowField()
+
+    obj = A(foo=[1]).clone(copy_on_write=True)
+    written = [2]
+
+    def write():
+        unsharing.wait()
+        obj.foo = written
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    assert obj.foo == [1]
+    writer.join()
+    assert obj.foo is written
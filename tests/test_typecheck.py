@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional, Union
+
+import pytest
+
+from objectmodel import *
+from objectmodel.typecheck import compile_type_checker
+
+try:
+    from typing import Literal
+except ImportError:
+    Literal = None
+
+
+def test_annotated_field_is_checked():
+    class A(ObjectModel):
+        foo: int = Field()
+
+    A(foo=1)
+    with pytest.raises(FieldValidationError):
+        A(foo='1')
+
+
+def test_not_annotated_field_is_not_checked():
+    class A(ObjectModel):
+        foo = Field()
+
+    A(foo='1')
+    assert A.__fields__['foo'].type_checker is None
+
+
+def test_generic_annotations():
+    class A(ObjectModel):
+        opt: Optional[str] = Field(allow_none=True)
+        items: List[int] = Field()
+        mapping: Dict[str, float] = Field()
+        union: Union[int, List[str]] = Field()
+
+    A(opt=None, items=[1, 2], mapping={'a': 1, 'b': 0.5}, union=['a'])
+    with pytest.raises(FieldValidationError):
+        A(items=[1, '2'])
+    with pytest.raises(FieldValidationError):
+        A(mapping={1: 1.0})
+    with pytest.raises(FieldValidationError):
+        A(union=[1])
+
+
+@pytest.mark.skipif(Literal is None, reason='typing.Literal requires python 3.8')
+def test_literal_annotation():
+    class A(ObjectModel):
+        mode: Literal['r', 'w'] = Field()
+
+    A(mode='r')
+    with pytest.raises(FieldValidationError):
+        A(mode='x')
+
+
+def test_nested_model_forward_reference():
+    class Node(ObjectModel):
+        value: int = Field()
+        children: List['Node'] = ListCollectionField('Node', default=list)
+        parent: Optional['Node'] = Field(allow_none=True)
+
+    class Other(ObjectModel):
+        pass
+
+    root = Node(value=1)
+    root.children.append(Node(value=2, parent=root))
+    with pytest.raises(FieldValidationError):
+        Node(value=3, parent=Other())
+    with pytest.raises(FieldValidationError):
+        Node(value=3, children=[Other()])
+
+
+def test_forward_reference_to_model_defined_later():
+    class A(ObjectModel):
+        b: 'LaterDefinedModel' = Field()
+
+    class LaterDefinedModel(ObjectModel):
+        pass
+
+    A(b=LaterDefinedModel())
+    with pytest.raises(FieldValidationError):
+        A(b=A())
+
+
+def test_checkers_are_shared():
+    class A(ObjectModel):
+        foo: Dict[str, List[int]] = Field()
+
+    class B(ObjectModel):
+        bar: Dict[str, List[int]] = Field()
+
+    assert A.__fields__['foo'].type_checker is B.__fields__['bar'].type_checker
+    assert compile_type_checker(Any).check(object())
+
+
+def test_string_annotations_share_checkers():
+    class A(ObjectModel):
+        foo: 'Dict[str, List[int]]' = Field()
+        users: List['SharedCheckerUser'] = Field(default=list)
+
+    class SharedCheckerUser(ObjectModel):
+        pass
+
+    class B(ObjectModel):
+        bar: 'Dict[str, List[int]]' = Field()
+        users: List['SharedCheckerUser'] = Field(default=list)
+
+    class C(ObjectModel):
+        users: 'List[SharedCheckerUser]' = Field(default=list)
+
+    assert A.__fields__['foo'].type_checker is B.__fields__['bar'].type_checker
+    assert B.__fields__['users'].type_checker is C.__fields__['users'].type_checker
+    # Not defined at the moment of A definition, resolved lazily
+    assert A.__fields__['users'].type_checker is not B.__fields__['users'].type_checker
+    A(users=[SharedCheckerUser()])
+    with pytest.raises(FieldValidationError):
+        A(users=[A()])
+
+
+def test_invalid_default_raises_at_class_creation():
+    with pytest.raises(FieldValidationError):
+        class A(ObjectModel):
+            foo: int = Field(default='1')
+
+
+def test_local_models_shadow_same_named_models():
+    def define():
+        class Item(ObjectModel):
+            value: int = Field()
+
+        class Holder(ObjectModel):
+            item: 'Item' = Field()
+            items = ListCollectionField('Item', default=list)
+        return Item, Holder
+
+    LocalItem, Holder = define()
+
+    # Defined later with the same name, but in another scope
+    class Item(ObjectModel):
+        pass
+
+    holder = Holder(item=LocalItem(value=1))
+    with pytest.raises(FieldValidationError):
+        Holder(item=Item())
+    holder.deserialize({'items': [{'value': 1}]})
+    assert type(holder.items[0]) is LocalItem